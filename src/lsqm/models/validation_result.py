@@ -52,7 +52,7 @@ class TerraformApplyResult:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Individual test result from pytest output."""
 
@@ -84,7 +84,7 @@ class TestResult:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationResult:
     """Result for a specific AWS API operation."""
 
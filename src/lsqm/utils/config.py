@@ -1,13 +1,32 @@
 """Configuration loading from environment and YAML file."""
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import cache
 from pathlib import Path
 
 import yaml
 
+# Prefer the libyaml-backed loader; it is far faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+
+# Field names per dataclass, looked up once for _fields_dict
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _fields_dict(obj) -> dict:
+    """Map a dataclass instance's field names to its values (not recursive)."""
+    names = _FIELD_NAMES.get(type(obj))
+    if names is None:
+        names = _FIELD_NAMES[type(obj)] = tuple(f.name for f in fields(obj))
+    return {name: getattr(obj, name) for name in names}
+
+
+@dataclass(slots=True)
 class TerraformRegistrySourceConfig:
     """Configuration for Terraform Registry discovery source."""
 
@@ -17,7 +36,7 @@ class TerraformRegistrySourceConfig:
     min_downloads: int = 1000  # Only modules with at least this many downloads
 
 
-@dataclass
+@dataclass(slots=True)
 class GitHubOrgsSourceConfig:
     """Configuration for GitHub Organizations discovery source."""
 
@@ -35,7 +54,7 @@ class GitHubOrgsSourceConfig:
     skip_forks: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerlessSourceConfig:
     """Configuration for Serverless Framework discovery source."""
 
@@ -49,7 +68,7 @@ class ServerlessSourceConfig:
     max_results: int = 100
 
 
-@dataclass
+@dataclass(slots=True)
 class CDKSourceConfig:
     """Configuration for AWS CDK Examples discovery source."""
 
@@ -63,7 +82,7 @@ class CDKSourceConfig:
     languages: list[str] = field(default_factory=lambda: ["typescript", "python"])
 
 
-@dataclass
+@dataclass(slots=True)
 class GitHubRepoConfig:
     """Configuration for a single GitHub repository."""
 
@@ -92,7 +111,7 @@ class GitHubRepoConfig:
         return cls()
 
 
-@dataclass
+@dataclass(slots=True)
 class GitHubReposSourceConfig:
     """Configuration for direct GitHub repository discovery."""
 
@@ -100,7 +119,7 @@ class GitHubReposSourceConfig:
     repositories: list[GitHubRepoConfig] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class LocalSourceConfig:
     """Configuration for local directory sources."""
 
@@ -108,7 +127,7 @@ class LocalSourceConfig:
     paths: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SourcesConfig:
     """Combined configuration for all discovery sources."""
 
@@ -123,143 +142,84 @@ class SourcesConfig:
 
     @classmethod
     def from_dict(cls, data: dict) -> "SourcesConfig":
-        """Create SourcesConfig from dictionary."""
+        """Create SourcesConfig from dictionary.
+
+        Each section may be a bool (enabled flag), a dict of settings, or for
+        some sections a list shorthand; see _SOURCE_SECTIONS.
+        """
         config = cls()
 
-        # GitHub Repos - direct repository URLs
-        if "github_repos" in data:
-            gr = data["github_repos"]
-            if isinstance(gr, bool):
-                config.github_repos.enabled = gr
-            elif isinstance(gr, list):
-                # Shorthand: just a list of repos
-                config.github_repos.repositories = [GitHubRepoConfig.from_value(r) for r in gr]
-            elif isinstance(gr, dict):
-                config.github_repos.enabled = gr.get("enabled", True)
-                if "repositories" in gr:
-                    config.github_repos.repositories = [
-                        GitHubRepoConfig.from_value(r) for r in gr["repositories"]
-                    ]
-
-        # GitHub Organizations
-        if "github_orgs" in data:
-            gh = data["github_orgs"]
-            if isinstance(gh, bool):
-                config.github_orgs.enabled = gh
-            elif isinstance(gh, list):
-                config.github_orgs.organizations = gh
-            elif isinstance(gh, dict):
-                config.github_orgs.enabled = gh.get("enabled", True)
-                if "organizations" in gh:
-                    config.github_orgs.organizations = gh["organizations"]
-                if "file_patterns" in gh:
-                    config.github_orgs.file_patterns = gh["file_patterns"]
-                if "max_files_per_repo" in gh:
-                    config.github_orgs.max_files_per_repo = gh["max_files_per_repo"]
-                if "skip_archived" in gh:
-                    config.github_orgs.skip_archived = gh["skip_archived"]
-                if "skip_forks" in gh:
-                    config.github_orgs.skip_forks = gh["skip_forks"]
-
-        # Terraform Registry
-        if "terraform_registry" in data:
-            tr = data["terraform_registry"]
-            if isinstance(tr, bool):
-                config.terraform_registry.enabled = tr
-            elif isinstance(tr, dict):
-                config.terraform_registry.enabled = tr.get("enabled", True)
-                if "providers" in tr:
-                    config.terraform_registry.providers = tr["providers"]
-                if "search_queries" in tr:
-                    config.terraform_registry.providers = tr["search_queries"]
-                if "limit_per_provider" in tr or "limit_per_query" in tr:
-                    config.terraform_registry.limit_per_provider = tr.get(
-                        "limit_per_provider", tr.get("limit_per_query", 100)
-                    )
-                if "min_downloads" in tr:
-                    config.terraform_registry.min_downloads = tr["min_downloads"]
-
-        # Serverless
-        if "serverless" in data:
-            sl = data["serverless"]
-            if isinstance(sl, bool):
-                config.serverless.enabled = sl
-            elif isinstance(sl, dict):
-                config.serverless.enabled = sl.get("enabled", True)
-                if "search_queries" in sl:
-                    config.serverless.search_queries = sl["search_queries"]
-                if "max_results" in sl:
-                    config.serverless.max_results = sl["max_results"]
-
-        # CDK
-        if "cdk" in data:
-            cdk = data["cdk"]
-            if isinstance(cdk, bool):
-                config.cdk.enabled = cdk
-            elif isinstance(cdk, dict):
-                config.cdk.enabled = cdk.get("enabled", True)
-                if "repositories" in cdk:
-                    config.cdk.repositories = cdk["repositories"]
-                if "languages" in cdk:
-                    config.cdk.languages = cdk["languages"]
-
-        # Local paths
-        if "local" in data:
-            local = data["local"]
-            if isinstance(local, bool):
-                config.local.enabled = local
-            elif isinstance(local, list):
-                config.local.enabled = True
-                config.local.paths = local
-            elif isinstance(local, dict):
-                config.local.enabled = local.get("enabled", False)
-                if "paths" in local:
-                    config.local.paths = local["paths"]
+        for name, list_attr, enabled_default, key_map in _SOURCE_SECTIONS:
+            value = data.get(name)
+            section = getattr(config, name)
+            if isinstance(value, bool):
+                section.enabled = value
+            elif isinstance(value, list) and list_attr:
+                section.enabled = True
+                setattr(section, list_attr, value)
+            elif isinstance(value, dict):
+                section.enabled = value.get("enabled", enabled_default)
+                for key, attr in key_map:
+                    if key in value:
+                        setattr(section, attr, value[key])
+
+        # Repositories are given as "owner/repo", URLs or full dicts
+        config.github_repos.repositories = [
+            GitHubRepoConfig.from_value(r) for r in config.github_repos.repositories
+        ]
 
         return config
 
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
-        return {
-            "github_repos": {
-                "enabled": self.github_repos.enabled,
-                "repositories": [
-                    {"url": r.url, "branch": r.branch, "paths": r.paths}
-                    for r in self.github_repos.repositories
-                ],
-            },
-            "github_orgs": {
-                "enabled": self.github_orgs.enabled,
-                "organizations": self.github_orgs.organizations,
-                "file_patterns": self.github_orgs.file_patterns,
-                "max_files_per_repo": self.github_orgs.max_files_per_repo,
-                "skip_archived": self.github_orgs.skip_archived,
-                "skip_forks": self.github_orgs.skip_forks,
-            },
-            "terraform_registry": {
-                "enabled": self.terraform_registry.enabled,
-                "providers": self.terraform_registry.providers,
-                "limit_per_provider": self.terraform_registry.limit_per_provider,
-                "min_downloads": self.terraform_registry.min_downloads,
-            },
-            "serverless": {
-                "enabled": self.serverless.enabled,
-                "search_queries": self.serverless.search_queries,
-                "max_results": self.serverless.max_results,
-            },
-            "cdk": {
-                "enabled": self.cdk.enabled,
-                "repositories": self.cdk.repositories,
-                "languages": self.cdk.languages,
-            },
-            "local": {
-                "enabled": self.local.enabled,
-                "paths": self.local.paths,
-            },
-        }
-
-
-@dataclass
+        data = {name: _fields_dict(section) for name, section in _fields_dict(self).items()}
+        data["github_repos"]["repositories"] = [
+            _fields_dict(r) for r in self.github_repos.repositories
+        ]
+        return data
+
+
+# Source sections as (name, list shorthand attribute, enabled default when
+# given as a dict, ((yaml key, attribute), ...)). Keys mapped to the same
+# attribute are applied in order, so later ones win.
+_SOURCE_SECTIONS: tuple[tuple[str, str | None, bool, tuple[tuple[str, str], ...]], ...] = (
+    ("github_repos", "repositories", True, (("repositories", "repositories"),)),
+    (
+        "github_orgs",
+        "organizations",
+        True,
+        (
+            ("organizations", "organizations"),
+            ("file_patterns", "file_patterns"),
+            ("max_files_per_repo", "max_files_per_repo"),
+            ("skip_archived", "skip_archived"),
+            ("skip_forks", "skip_forks"),
+        ),
+    ),
+    (
+        "terraform_registry",
+        None,
+        True,
+        (
+            ("providers", "providers"),
+            ("search_queries", "providers"),
+            ("limit_per_query", "limit_per_provider"),
+            ("limit_per_provider", "limit_per_provider"),
+            ("min_downloads", "min_downloads"),
+        ),
+    ),
+    (
+        "serverless",
+        None,
+        True,
+        (("search_queries", "search_queries"), ("max_results", "max_results")),
+    ),
+    ("cdk", None, True, (("repositories", "repositories"), ("languages", "languages"))),
+    ("local", "paths", False, (("paths", "paths"),)),
+)
+
+
+@dataclass(slots=True)
 class LSQMConfig:
     """LSQM configuration from environment and config file."""
 
@@ -310,6 +270,21 @@ class LSQMConfig:
         return self.artifact_repo
 
 
+# Environment overrides as (variable, attribute, conversion); credentials are
+# stripped to handle common copy/paste errors
+_ENV_OVERRIDES = (
+    ("ANTHROPIC_API_KEY", "anthropic_api_key", str.strip),
+    ("GITHUB_TOKEN", "github_token", str.strip),
+    ("ARTIFACT_REPO", "artifact_repo", str.strip),
+    ("ANTHROPIC_TOKEN_BUDGET", "token_budget", int),
+    ("LOCALSTACK_VERSION", "localstack_version", None),
+    ("LSQM_PARALLEL", "parallel", int),
+    ("LSQM_TIMEOUT", "timeout", int),
+    ("SLACK_WEBHOOK_URL", "slack_webhook_url", None),
+    ("ISSUE_REPO", "issue_repo", None),
+)
+
+
 def load_config(config_path: Path | None = None, sources_path: Path | None = None) -> LSQMConfig:
     """Load configuration from environment variables and optional YAML files.
 
@@ -327,15 +302,15 @@ def load_config(config_path: Path | None = None, sources_path: Path | None = Non
 
     # Default config path
     if config_path is None:
-        default_path = Path.home() / ".lsqm" / "config.yaml"
+        default_path = _lsqm_home() / "config.yaml"
         if default_path.exists():
             config_path = default_path
 
     # Load from main YAML if available
     if config_path and config_path.exists():
         config.config_path = config_path
-        with open(config_path) as f:
-            yaml_config = yaml.safe_load(f) or {}
+        with open(config_path, "rb") as f:
+            yaml_config = yaml.load(f, Loader=_YamlLoader) or {}
 
         # Map YAML keys to config attributes
         if "anthropic_api_key" in yaml_config:
@@ -363,43 +338,36 @@ def load_config(config_path: Path | None = None, sources_path: Path | None = Non
     # Priority: explicit path > ./sources.yaml > ~/.lsqm/sources.yaml
     if sources_path is None:
         local_sources = Path("sources.yaml")
-        home_sources = Path.home() / ".lsqm" / "sources.yaml"
+        home_sources = _lsqm_home() / "sources.yaml"
         if local_sources.exists():
             sources_path = local_sources
         elif home_sources.exists():
             sources_path = home_sources
 
     if sources_path and sources_path.exists():
-        with open(sources_path) as f:
-            sources_yaml = yaml.safe_load(f) or {}
+        with open(sources_path, "rb") as f:
+            sources_yaml = yaml.load(f, Loader=_YamlLoader) or {}
         config.sources = SourcesConfig.from_dict(sources_yaml)
 
-    # Override with environment variables (strip whitespace to handle common input errors)
-    if env_key := os.getenv("ANTHROPIC_API_KEY"):
-        config.anthropic_api_key = env_key.strip()
-    if env_token := os.getenv("GITHUB_TOKEN"):
-        config.github_token = env_token.strip()
-    if env_repo := os.getenv("ARTIFACT_REPO"):
-        config.artifact_repo = env_repo.strip()
-    if env_budget := os.getenv("ANTHROPIC_TOKEN_BUDGET"):
-        config.token_budget = int(env_budget)
-    if env_version := os.getenv("LOCALSTACK_VERSION"):
-        config.localstack_version = env_version
-    if env_parallel := os.getenv("LSQM_PARALLEL"):
-        config.parallel = int(env_parallel)
-    if env_timeout := os.getenv("LSQM_TIMEOUT"):
-        config.timeout = int(env_timeout)
-    if env_slack := os.getenv("SLACK_WEBHOOK_URL"):
-        config.slack_webhook_url = env_slack
-    if env_issue_repo := os.getenv("ISSUE_REPO"):
-        config.issue_repo = env_issue_repo
+    # Override with environment variables
+    env = os.environ
+    for var, attr, convert in _ENV_OVERRIDES:
+        if value := env.get(var):
+            setattr(config, attr, convert(value) if convert else value)
 
     return config
 
 
+@cache
+def _lsqm_home() -> Path:
+    """Get the ~/.lsqm directory, resolving the home directory only once."""
+    return Path.home() / ".lsqm"
+
+
+@cache
 def get_cache_dir() -> Path:
-    """Get the local cache directory for LSQM."""
-    cache_dir = Path.home() / ".lsqm" / "cache"
+    """Get the local cache directory for LSQM, creating it on the first call."""
+    cache_dir = _lsqm_home() / "cache"
     cache_dir.mkdir(parents=True, exist_ok=True)
     return cache_dir
 
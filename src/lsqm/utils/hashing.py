@@ -3,6 +3,12 @@
 import hashlib
 import re
 
+# Inline comments of either style, from the first marker to the end of the
+# line; lines are split on "\n" first, so no end anchor is needed
+_COMMENT_RE = re.compile(r"(?:#|//).*")
+
+_HASH_RE = re.compile(r"[0-9a-fA-F]{16}")
+
 
 def normalize_terraform(content: str) -> str:
     """Normalize Terraform content for consistent hashing.
@@ -13,18 +19,15 @@ def normalize_terraform(content: str) -> str:
     """
     lines = []
     for line in content.split("\n"):
-        # Remove inline comments
-        line = re.sub(r"#.*$", "", line)
-        line = re.sub(r"//.*$", "", line)
+        # Remove inline comments (most lines have none, so skip the regex then)
+        if "#" in line or "//" in line:
+            line = _COMMENT_RE.sub("", line)
 
-        # Skip empty lines
-        stripped = line.strip()
-        if not stripped:
-            continue
-
-        # Normalize whitespace (collapse multiple spaces)
-        normalized = " ".join(stripped.split())
-        lines.append(normalized)
+        # Normalize whitespace (collapse multiple spaces), skipping empty lines;
+        # split() already drops leading and trailing whitespace
+        parts = line.split()
+        if parts:
+            lines.append(" ".join(parts))
 
     return "\n".join(lines)
 
@@ -38,18 +41,20 @@ def compute_architecture_hash(tf_files: dict[str, str]) -> str:
     Returns:
         16-character hexadecimal hash
     """
-    normalized_parts = []
+    # Feed each file to the hash as it is normalized rather than joining the
+    # whole corpus first; the digest is the same as for the "\n"-joined parts
+    digest = hashlib.sha256()
+    separator = b""
 
     # Sort files alphabetically for deterministic ordering
-    for filename in sorted(tf_files.keys()):
+    for filename in sorted(tf_files):
         content = normalize_terraform(tf_files[filename])
-        normalized_parts.append(f"# {filename}\n{content}")
-
-    combined = "\n".join(normalized_parts)
-    full_hash = hashlib.sha256(combined.encode()).hexdigest()
+        digest.update(separator)
+        digest.update(f"# {filename}\n{content}".encode())
+        separator = b"\n"
 
-    # Return first 16 characters (64 bits - sufficient for ~10K architectures)
-    return full_hash[:16]
+    # Return first 16 hex characters (64 bits - sufficient for ~10K architectures)
+    return digest.digest()[:8].hex()
 
 
 def compute_content_hash(content: str) -> str:
@@ -61,8 +66,7 @@ def compute_content_hash(content: str) -> str:
     Returns:
         16-character hexadecimal hash
     """
-    full_hash = hashlib.sha256(content.encode()).hexdigest()
-    return full_hash[:16]
+    return hashlib.sha256(content.encode()).digest()[:8].hex()
 
 
 def validate_hash(hash_value: str) -> bool:
@@ -74,10 +78,4 @@ def validate_hash(hash_value: str) -> bool:
     Returns:
         True if hash is 16 hexadecimal characters
     """
-    if len(hash_value) != 16:
-        return False
-    try:
-        int(hash_value, 16)
-        return True
-    except ValueError:
-        return False
+    return _HASH_RE.fullmatch(hash_value) is not None
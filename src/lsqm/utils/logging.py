@@ -1,39 +1,145 @@
 """Structured JSON logging with stage timing."""
 
-import json
+import atexit
 import logging
+import queue
 import sys
 import time
-from contextlib import contextmanager
-from datetime import datetime
+from contextlib import contextmanager, suppress
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+import orjson
+
+# Second-resolution ISO prefix of the last formatted timestamp, as (second, prefix)
+_timestamp_cache: tuple[int, str] = (-1, "")
+
+
+def _format_timestamp(created: float) -> str:
+    """Format a record's creation time as an ISO 8601 UTC timestamp.
+
+    Records mostly arrive in bursts within the same second, so the part up to
+    the seconds is reused and only the microseconds are formatted each time.
+    """
+    global _timestamp_cache
+    second = int(created)
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int((created - second) * 1_000_000):06d}Z"
+
 
 class JSONFormatter(logging.Formatter):
     """Format log records as JSON with structured fields."""
 
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _format_timestamp(record.created),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
         }
 
-        # Add extra fields if present
-        if hasattr(record, "stage"):
-            log_data["stage"] = record.stage
-        if hasattr(record, "duration"):
-            log_data["duration_seconds"] = record.duration
-        if hasattr(record, "error_type"):
+        # Add extra fields if present (logging stores them in the record's __dict__)
+        fields = record.__dict__
+        if "stage" in fields:
+            log_data["stage"] = fields["stage"]
+        if "duration" in fields:
+            log_data["duration_seconds"] = fields["duration"]
+        if "error_type" in fields:
             log_data["error"] = {
-                "type": record.error_type,
-                "message": getattr(record, "error_message", ""),
+                "type": fields["error_type"],
+                "message": fields.get("error_message", ""),
             }
-        if hasattr(record, "extra"):
-            log_data.update(record.extra)
+        if "extra" in fields:
+            log_data.update(fields["extra"])
+
+        # Extra fields may carry non-string keys, which json.dumps accepted too
+        return orjson.dumps(log_data, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class _BatchingStreamHandler(logging.StreamHandler):
+    """StreamHandler that collects formatted lines and writes them together on flush.
+
+    Used behind a _DrainingQueueListener, which flushes whenever its queue runs
+    empty, so a burst of records becomes a single write to the stream.
+    """
+
+    max_pending = 64
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._pending: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._pending.append(record)
+        if len(self._pending) >= self.max_pending:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            records, self._pending = self._pending, []
+            lines = []
+            for record in records:
+                try:
+                    lines.append(self.format(record) + self.terminator)
+                except Exception:
+                    self.handleError(record)
+            try:
+                if lines:
+                    self.stream.write("".join(lines))
+                super().flush()
+            except RecursionError:
+                raise
+            except Exception:
+                # Drop the batch, as StreamHandler.emit drops a record it
+                # cannot write; raising here would end the listener thread.
+                # handleError itself fails if the stream was sys.stderr and
+                # that is closed, and then there is nowhere left to report to.
+                if records:
+                    with suppress(ValueError):
+                        self.handleError(records[0])
+        finally:
+            self.release()
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers once the queue is drained."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+    def stop(self) -> None:
+        super().stop()
+        for handler in self.handlers:
+            # At exit the stream may already be closed; logging.shutdown
+            # tolerates that as well
+            with suppress(OSError, ValueError):
+                handler.flush()
 
-        return json.dumps(log_data)
+
+class _PassthroughQueueHandler(QueueHandler):
+    """QueueHandler that enqueues records as they are, for an in-process listener.
+
+    QueueHandler.prepare formats each record on the logging thread so it can be
+    pickled; the listener here shares the process, so formatting is left to it.
+    Arguments are therefore rendered later and must not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Event payloads of StageTimer records; shared between records, so never mutated
+_STAGE_END_EVENTS = {
+    True: {"event": "stage_complete", "success": True},
+    False: {"event": "stage_failed", "success": False},
+}
 
 
 class StageTimer:
@@ -42,48 +148,93 @@ class StageTimer:
     def __init__(self, stage_name: str, logger: logging.Logger):
         self.stage_name = stage_name
         self.logger = logger
-        self.start_time: float = 0
-        self.end_time: float = 0
+        # Monotonic perf_counter_ns() readings, immune to wall-clock adjustments
+        self.start_time: int = 0
+        self.end_time: int = 0
+        self._start_extra = {"stage": stage_name, "extra": {"event": "stage_start"}}
 
     def start(self) -> None:
         """Mark stage start."""
-        self.start_time = time.time()
-        self.logger.info(
-            f"Stage {self.stage_name} started",
-            extra={"stage": self.stage_name, "extra": {"event": "stage_start"}},
-        )
+        self.start_time = time.perf_counter_ns()
+        self.logger.info("Stage %s started", self.stage_name, extra=self._start_extra)
 
     def end(self, success: bool = True) -> float:
         """Mark stage end and return duration."""
-        self.end_time = time.time()
-        duration = self.end_time - self.start_time
-        event = "stage_complete" if success else "stage_failed"
-        self.logger.info(
-            f"Stage {self.stage_name} {'completed' if success else 'failed'} in {duration:.2f}s",
-            extra={
-                "stage": self.stage_name,
-                "duration": duration,
-                "extra": {"event": event, "success": success},
-            },
-        )
+        self.end_time = time.perf_counter_ns()
+        duration = (self.end_time - self.start_time) / 1e9
+        # Records are formatted later on the listener thread, so the duration
+        # goes into a fresh dict rather than a template updated in place
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Stage %s %s in %.2fs",
+                self.stage_name,
+                "completed" if success else "failed",
+                duration,
+                extra={
+                    "stage": self.stage_name,
+                    "duration": duration,
+                    "extra": _STAGE_END_EVENTS[success],
+                },
+            )
         return duration
 
 
+_ROOT_LOGGER_NAME = "lsqm"
+
+# QueueHandler feeding the one stderr writer, created by the first get_logger call
+_queue_handler: _PassthroughQueueHandler | None = None
+_log_listener: QueueListener | None = None
+
+
+def _get_queue_handler(verbose: bool) -> _PassthroughQueueHandler:
+    """Return the shared queue handler, starting its listener on first use."""
+    global _queue_handler, _log_listener
+    if _queue_handler is None:
+        handler = _BatchingStreamHandler(sys.stderr)
+        handler.setFormatter(JSONFormatter() if verbose else logging.Formatter("%(message)s"))
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _log_listener = _DrainingQueueListener(log_queue, handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(flush_logs)
+        _queue_handler = _PassthroughQueueHandler(log_queue)
+    return _queue_handler
+
+
+def flush_logs() -> None:
+    """Write out every queued log record and stop the listener thread.
+
+    Runs at exit. Code that ends the process without running atexit handlers
+    (such as re-raising a fatal signal) must call it first, or the last
+    records are lost.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        listener, _log_listener = _log_listener, None
+        listener.stop()
+
+
 def get_logger(name: str, verbose: bool = False) -> logging.Logger:
-    """Get a logger configured for LSQM."""
+    """Get a logger configured for LSQM.
+
+    All loggers share one handler: records are formatted and written to
+    stderr by a single background listener thread, so logging calls never
+    block on the write, and records arriving together are written together;
+    the listener is stopped (and its queue drained) at exit. The handler sits
+    on the "lsqm" logger, and loggers below it reach it by propagation.
+    """
     logger = logging.getLogger(name)
 
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stderr)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
-        if verbose:
-            handler.setFormatter(JSONFormatter())
-            logger.setLevel(logging.DEBUG)
+        handler = _get_queue_handler(verbose)
+        if name == _ROOT_LOGGER_NAME or not name.startswith(_ROOT_LOGGER_NAME + "."):
+            logger.addHandler(handler)
         else:
-            handler.setFormatter(logging.Formatter("%(message)s"))
-            logger.setLevel(logging.INFO)
-
-        logger.addHandler(handler)
+            root = logging.getLogger(_ROOT_LOGGER_NAME)
+            if handler not in root.handlers:
+                root.addHandler(handler)
 
     return logger
 
@@ -98,14 +249,20 @@ def stage_context(stage_name: str, logger: logging.Logger):
         timer.end(success=True)
     except Exception as e:
         timer.end(success=False)
-        logger.error(
-            f"Stage {stage_name} error: {e}",
-            extra={
-                "stage": stage_name,
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-            },
-        )
+        if logger.isEnabledFor(logging.ERROR):
+            # str(e) may be costly (wrapped subprocess output); render it once
+            # for both the message and the error_message field
+            error_message = str(e)
+            logger.error(
+                "Stage %s error: %s",
+                stage_name,
+                error_message,
+                extra={
+                    "stage": stage_name,
+                    "error_type": type(e).__name__,
+                    "error_message": error_message,
+                },
+            )
         raise
 
 
@@ -117,6 +274,9 @@ def log_error(
     **extra: Any,
 ) -> None:
     """Log an error with structured context."""
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+
     log_extra: dict[str, Any] = {
         "error_type": type(error).__name__,
         "error_message": str(error),
@@ -1,16 +1,77 @@
 """Shared pytest fixtures for LSQM tests."""
 
-import tempfile
+import copy
+import json
 from pathlib import Path
 
 import pytest
 
+# Sample data defined once; the fixtures hand each test its own deep copy
+SAMPLE_ARCHITECTURE = {
+    "hash": "a1b2c3d4e5f67890",
+    "source_url": "https://registry.terraform.io/modules/terraform-aws-modules/vpc/aws/5.1.0",
+    "source_type": "terraform_registry",
+    "discovered_at": "2026-01-10T00:00:00Z",
+    "services": ["ec2", "vpc"],
+    "resource_count": 23,
+    "name": "terraform-aws-vpc",
+    "description": "Terraform module for creating AWS VPC resources",
+    "version": "5.1.0",
+    "skipped": False,
+}
+
+SAMPLE_VALIDATION_RESULT = {
+    "arch_hash": "a1b2c3d4e5f67890",
+    "run_id": "550e8400-e29b-41d4-a716-446655440000",
+    "status": "PASSED",
+    "started_at": "2026-01-10T01:00:00Z",
+    "completed_at": "2026-01-10T01:00:45Z",
+    "duration_seconds": 45.0,
+    "terraform_apply": {
+        "success": True,
+        "resources_created": 5,
+        "outputs": {"vpc_id": "vpc-12345"},
+        "logs": "",
+    },
+    "pytest_results": {
+        "total": 5,
+        "passed": 5,
+        "failed": 0,
+        "skipped": 0,
+        "output": "",
+    },
+}
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test artifacts."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_dir(tmp_path_factory) -> Path:
+    """Create a temporary directory for test artifacts.
+
+    Directories live under pytest's per-session temp root, which pytest
+    prunes by its own retention policy.
+    """
+    return tmp_path_factory.mktemp("lsqm")
+
+
+@pytest.fixture(scope="module")
+def artifacts_dir(tmp_path_factory) -> Path:
+    """Create an artifacts tree with a one-architecture index.
+
+    Built once per module; tests must treat it as read-only and write their
+    output elsewhere.
+    """
+    artifacts = tmp_path_factory.mktemp("artifacts")
+    (artifacts / "architectures").mkdir()
+    index = {
+        "architectures": {
+            "a1b2c3d4": {
+                "name": "test-arch",
+                "services": ["s3", "lambda"],
+            }
+        }
+    }
+    (artifacts / "architectures" / "index.json").write_text(json.dumps(index))
+    return artifacts
 
 
 @pytest.fixture
@@ -25,41 +86,10 @@ def mock_env(monkeypatch):
 @pytest.fixture
 def sample_architecture():
     """Return a sample architecture metadata dictionary."""
-    return {
-        "hash": "a1b2c3d4e5f67890",
-        "source_url": "https://registry.terraform.io/modules/terraform-aws-modules/vpc/aws/5.1.0",
-        "source_type": "terraform_registry",
-        "discovered_at": "2026-01-10T00:00:00Z",
-        "services": ["ec2", "vpc"],
-        "resource_count": 23,
-        "name": "terraform-aws-vpc",
-        "description": "Terraform module for creating AWS VPC resources",
-        "version": "5.1.0",
-        "skipped": False,
-    }
+    return copy.deepcopy(SAMPLE_ARCHITECTURE)
 
 
 @pytest.fixture
 def sample_validation_result():
     """Return a sample validation result dictionary."""
-    return {
-        "arch_hash": "a1b2c3d4e5f67890",
-        "run_id": "550e8400-e29b-41d4-a716-446655440000",
-        "status": "PASSED",
-        "started_at": "2026-01-10T01:00:00Z",
-        "completed_at": "2026-01-10T01:00:45Z",
-        "duration_seconds": 45.0,
-        "terraform_apply": {
-            "success": True,
-            "resources_created": 5,
-            "outputs": {"vpc_id": "vpc-12345"},
-            "logs": "",
-        },
-        "pytest_results": {
-            "total": 5,
-            "passed": 5,
-            "failed": 0,
-            "skipped": 0,
-            "output": "",
-        },
-    }
+    return copy.deepcopy(SAMPLE_VALIDATION_RESULT)
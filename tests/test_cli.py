@@ -5,10 +5,12 @@ from click.testing import CliRunner
 
 from lsqm.cli import main
 
+pytestmark = pytest.mark.cli
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def cli_runner():
-    """Create a Click CLI test runner."""
+    """Create a Click CLI test runner (stateless between invocations, so shared)."""
     return CliRunner()
 
 
@@ -51,15 +53,45 @@ class TestMainCLI:
         assert "clean" in result.output
 
 
-class TestSyncCommand:
-    """Tests for sync command."""
-
-    def test_sync_help(self, cli_runner):
-        """Test sync --help."""
-        result = cli_runner.invoke(main, ["sync", "--help"])
+class TestSubcommands:
+    """Tests shared by all subcommands."""
+
+    @pytest.mark.parametrize(
+        ("command", "keywords", "options"),
+        [
+            ("sync", ("Sync", "sync"), ()),
+            ("mine", ("Discover", "mine"), ()),
+            ("generate", ("Generate", "generate"), ("--budget",)),
+            ("validate", ("Validate", "validate"), ()),
+            ("report", ("report", "Report"), ()),
+            ("push", ("Push", "push"), ()),
+            ("compare", ("Compare", "compare"), ()),
+            ("notify", ("notify", "Notify"), ()),
+            ("status", ("status", "Status"), ()),
+            ("clean", ("clean", "Clean"), ("--containers", "--cache")),
+            ("run", ("pipeline", "Pipeline", "run", "Run"), ()),
+        ],
+    )
+    def test_subcommand_help(self, cli_runner, command, keywords, options):
+        """Test <command> --help."""
+        result = cli_runner.invoke(main, [command, "--help"])
+
+        assert result.exit_code == 0
+        assert any(keyword in result.output for keyword in keywords)
+        for option in options:
+            assert option in result.output
+
+    @pytest.mark.parametrize("command", ["validate", "report", "push", "compare", "clean"])
+    def test_subcommand_dry_run(self, cli_runner, command):
+        """Test <command> in dry-run mode."""
+        result = cli_runner.invoke(main, ["--dry-run", command])
 
         assert result.exit_code == 0
-        assert "Sync" in result.output or "sync" in result.output
+        assert "DRY RUN" in result.output
+
+
+class TestSyncCommand:
+    """Tests for sync command."""
 
     def test_sync_dry_run(self, cli_runner):
         """Test sync in dry-run mode."""
@@ -73,13 +105,6 @@ class TestSyncCommand:
 class TestMineCommand:
     """Tests for mine command."""
 
-    def test_mine_help(self, cli_runner):
-        """Test mine --help."""
-        result = cli_runner.invoke(main, ["mine", "--help"])
-
-        assert result.exit_code == 0
-        assert "Discover" in result.output or "mine" in result.output
-
     def test_mine_dry_run(self, cli_runner):
         """Test mine in dry-run mode."""
         result = cli_runner.invoke(main, ["--dry-run", "mine", "--limit", "5"])
@@ -99,14 +124,6 @@ class TestMineCommand:
 class TestGenerateCommand:
     """Tests for generate command."""
 
-    def test_generate_help(self, cli_runner):
-        """Test generate --help."""
-        result = cli_runner.invoke(main, ["generate", "--help"])
-
-        assert result.exit_code == 0
-        assert "Generate" in result.output or "generate" in result.output
-        assert "--budget" in result.output
-
     def test_generate_dry_run(self, cli_runner):
         """Test generate in dry-run mode."""
         result = cli_runner.invoke(main, ["--dry-run", "generate", "--budget", "50000"])
@@ -119,20 +136,6 @@ class TestGenerateCommand:
 class TestValidateCommand:
     """Tests for validate command."""
 
-    def test_validate_help(self, cli_runner):
-        """Test validate --help."""
-        result = cli_runner.invoke(main, ["validate", "--help"])
-
-        assert result.exit_code == 0
-        assert "Validate" in result.output or "validate" in result.output
-
-    def test_validate_dry_run(self, cli_runner):
-        """Test validate in dry-run mode."""
-        result = cli_runner.invoke(main, ["--dry-run", "validate"])
-
-        assert result.exit_code == 0
-        assert "DRY RUN" in result.output
-
     def test_validate_with_parallel(self, cli_runner):
         """Test validate with parallel setting."""
         result = cli_runner.invoke(main, ["--parallel", "2", "--dry-run", "validate"])
@@ -141,70 +144,9 @@ class TestValidateCommand:
         assert "Parallel: 2" in result.output
 
 
-class TestReportCommand:
-    """Tests for report command."""
-
-    def test_report_help(self, cli_runner):
-        """Test report --help."""
-        result = cli_runner.invoke(main, ["report", "--help"])
-
-        assert result.exit_code == 0
-        assert "report" in result.output.lower()
-
-    def test_report_dry_run(self, cli_runner):
-        """Test report in dry-run mode."""
-        result = cli_runner.invoke(main, ["--dry-run", "report"])
-
-        assert result.exit_code == 0
-        assert "DRY RUN" in result.output
-
-
-class TestPushCommand:
-    """Tests for push command."""
-
-    def test_push_help(self, cli_runner):
-        """Test push --help."""
-        result = cli_runner.invoke(main, ["push", "--help"])
-
-        assert result.exit_code == 0
-        assert "Push" in result.output or "push" in result.output
-
-    def test_push_dry_run(self, cli_runner):
-        """Test push in dry-run mode."""
-        result = cli_runner.invoke(main, ["--dry-run", "push"])
-
-        assert result.exit_code == 0
-        assert "DRY RUN" in result.output
-
-
-class TestCompareCommand:
-    """Tests for compare command."""
-
-    def test_compare_help(self, cli_runner):
-        """Test compare --help."""
-        result = cli_runner.invoke(main, ["compare", "--help"])
-
-        assert result.exit_code == 0
-        assert "Compare" in result.output or "compare" in result.output
-
-    def test_compare_dry_run(self, cli_runner):
-        """Test compare in dry-run mode."""
-        result = cli_runner.invoke(main, ["--dry-run", "compare"])
-
-        assert result.exit_code == 0
-        assert "DRY RUN" in result.output
-
-
 class TestNotifyCommand:
     """Tests for notify command."""
 
-    def test_notify_help(self, cli_runner):
-        """Test notify --help."""
-        result = cli_runner.invoke(main, ["notify", "--help"])
-
-        assert result.exit_code == 0
-        assert "notify" in result.output.lower()
-
     def test_notify_dry_run(self, cli_runner):
         """Test notify in dry-run mode."""
         result = cli_runner.invoke(main, ["--dry-run", "notify"])
@@ -217,13 +159,6 @@ class TestNotifyCommand:
 class TestStatusCommand:
     """Tests for status command."""
 
-    def test_status_help(self, cli_runner):
-        """Test status --help."""
-        result = cli_runner.invoke(main, ["status", "--help"])
-
-        assert result.exit_code == 0
-        assert "status" in result.output.lower()
-
     def test_status_output(self, cli_runner):
         """Test status command output."""
         result = cli_runner.invoke(main, ["status"])
@@ -241,36 +176,9 @@ class TestStatusCommand:
         assert "Architectures:" in result.output
 
 
-class TestCleanCommand:
-    """Tests for clean command."""
-
-    def test_clean_help(self, cli_runner):
-        """Test clean --help."""
-        result = cli_runner.invoke(main, ["clean", "--help"])
-
-        assert result.exit_code == 0
-        assert "clean" in result.output.lower()
-        assert "--containers" in result.output
-        assert "--cache" in result.output
-
-    def test_clean_dry_run(self, cli_runner):
-        """Test clean in dry-run mode."""
-        result = cli_runner.invoke(main, ["--dry-run", "clean"])
-
-        assert result.exit_code == 0
-        assert "DRY RUN" in result.output
-
-
 class TestRunCommand:
     """Tests for run command (full pipeline)."""
 
-    def test_run_help(self, cli_runner):
-        """Test run --help."""
-        result = cli_runner.invoke(main, ["run", "--help"])
-
-        assert result.exit_code == 0
-        assert "pipeline" in result.output.lower() or "run" in result.output.lower()
-
     def test_run_requires_config(self, cli_runner, monkeypatch):
         """Test that run command requires configuration."""
         # Clear any existing env vars
@@ -1,10 +1,15 @@
 """Tests for LSQM service modules."""
 
-import json
+import asyncio
+import os
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from lsqm.models import ValidationStatus
+from lsqm.services import validator
 from lsqm.services.comparator import compare_runs, create_regression_objects
+from lsqm.services.generator import _extract_files_from_response, _validate_python_syntax
 from lsqm.services.localstack_services import (
     LOCALSTACK_COMMUNITY_SERVICES,
     extract_services_from_terraform,
@@ -15,56 +20,38 @@ from lsqm.services.normalizer import (
     serverless_to_terraform,
 )
 from lsqm.services.reporter import generate_html_report
+from lsqm.services.validator import (
+    _aggregate_test_counts,
+    _collect_state_resources,
+    _ContainerPool,
+    _get_container_logs,
+    _parse_junit_report,
+    _parse_pytest_verbose_output,
+    _remove_backend_configuration,
+    _remove_orphaned_containers,
+    _remove_pro_only_resources,
+    _remove_provider_default_tags,
+    _rewrite_tf_files,
+    _stage_files,
+    _wait_or_kill,
+    cleanup_stale_containers,
+)
 
-
-class TestLocalStackServices:
-    """Tests for LocalStack services module."""
-
-    def test_is_service_supported_valid(self):
-        """Test that valid services are recognized."""
-        assert is_service_supported("s3") is True
-        assert is_service_supported("lambda") is True
-        assert is_service_supported("dynamodb") is True
-        assert is_service_supported("ec2") is True
-        assert is_service_supported("sqs") is True
-
-    def test_is_service_supported_invalid(self):
-        """Test that invalid services are rejected."""
-        assert is_service_supported("fake_service") is False
-        assert is_service_supported("not_aws") is False
-        assert is_service_supported("") is False
-
-    def test_localstack_services_not_empty(self):
-        """Test that LOCALSTACK_COMMUNITY_SERVICES set is populated."""
-        assert len(LOCALSTACK_COMMUNITY_SERVICES) > 0
-        assert "s3" in LOCALSTACK_COMMUNITY_SERVICES
-        assert "lambda" in LOCALSTACK_COMMUNITY_SERVICES
-
-    def test_extract_services_from_terraform_s3(self):
-        """Test extracting S3 service from Terraform."""
-        tf_content = """
+_TF_BUCKET = """
 resource "aws_s3_bucket" "example" {
   bucket = "my-bucket"
 }
 """
-        services = extract_services_from_terraform(tf_content)
-        assert "s3" in services
 
-    def test_extract_services_from_terraform_lambda(self):
-        """Test extracting Lambda service from Terraform."""
-        tf_content = """
+_TF_LAMBDA = """
 resource "aws_lambda_function" "example" {
   function_name = "my-function"
   handler       = "index.handler"
   runtime       = "python3.9"
 }
 """
-        services = extract_services_from_terraform(tf_content)
-        assert "lambda" in services
 
-    def test_extract_services_from_terraform_multiple(self):
-        """Test extracting multiple services from Terraform."""
-        tf_content = """
+_TF_MULTI_RESOURCES = """
 resource "aws_s3_bucket" "bucket" {
   bucket = "my-bucket"
 }
@@ -81,20 +68,8 @@ resource "aws_sqs_queue" "queue" {
   name = "my-queue"
 }
 """
-        services = extract_services_from_terraform(tf_content)
-        assert "s3" in services
-        assert "lambda" in services
-        assert "dynamodb" in services
-        assert "sqs" in services
-
-    def test_extract_services_empty_content(self):
-        """Test extracting services from empty content."""
-        services = extract_services_from_terraform("")
-        assert len(services) == 0
-
-    def test_extract_services_no_aws_resources(self):
-        """Test extracting services when no AWS resources present."""
-        tf_content = """
+
+_TF_NO_RESOURCES = """
 variable "region" {
   default = "us-east-1"
 }
@@ -103,23 +78,8 @@ output "message" {
   value = "hello"
 }
 """
-        services = extract_services_from_terraform(tf_content)
-        assert len(services) == 0
 
-    def test_is_standalone_with_resources(self):
-        """Test that architecture with resources is standalone."""
-        tf_content = """
-resource "aws_s3_bucket" "example" {
-  bucket = "my-bucket"
-}
-"""
-        is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is True
-        assert reason == ""
-
-    def test_is_standalone_with_resources_and_defaults(self):
-        """Test that architecture with defaulted variables is standalone."""
-        tf_content = """
+_TF_DEFAULTED_VAR = """
 variable "bucket_name" {
   default = "my-bucket"
 }
@@ -128,12 +88,8 @@ resource "aws_s3_bucket" "example" {
   bucket = var.bucket_name
 }
 """
-        is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is True
 
-    def test_not_standalone_required_variables(self):
-        """Test that architecture with required variables is not standalone."""
-        tf_content = """
+_TF_REQUIRED_VAR = """
 variable "bucket_name" {
   description = "Required bucket name"
 }
@@ -142,13 +98,8 @@ resource "aws_s3_bucket" "example" {
   bucket = var.bucket_name
 }
 """
-        is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is False
-        assert "Required variables" in reason
 
-    def test_not_standalone_module_only(self):
-        """Test that module-only composition is not standalone."""
-        tf_content = """
+_TF_MODULE_ONLY = """
 module "vpc" {
   source = "terraform-aws-modules/vpc/aws"
   version = "3.0.0"
@@ -158,28 +109,8 @@ module "lambda" {
   source = "./modules/lambda"
 }
 """
-        is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is False
-        assert "module composition" in reason.lower()
-
-    def test_not_standalone_no_resources(self):
-        """Test that empty config is not standalone."""
-        tf_content = """
-variable "region" {
-  default = "us-east-1"
-}
-
-output "message" {
-  value = "hello"
-}
-"""
-        is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is False
-        assert "No resources" in reason
 
-    def test_not_standalone_remote_state(self):
-        """Test that config with remote state dependency is not standalone."""
-        tf_content = """
+_TF_REMOTE_STATE = """
 data "terraform_remote_state" "vpc" {
   backend = "s3"
 }
@@ -189,13 +120,8 @@ resource "aws_lambda_function" "example" {
   subnet_ids    = data.terraform_remote_state.vpc.outputs.subnet_ids
 }
 """
-        is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is False
-        assert "external state" in reason.lower()
 
-    def test_standalone_with_allowed_data_sources(self):
-        """Test that architecture with non-problematic data sources is standalone."""
-        tf_content = """
+_TF_ALLOWED_DATA_SOURCES = """
 data "aws_region" "current" {}
 data "aws_availability_zones" "available" {}
 
@@ -203,83 +129,238 @@ resource "aws_s3_bucket" "example" {
   bucket = "my-bucket-${data.aws_region.current.name}"
 }
 """
+
+_SLS_BASIC = """
+service: my-service
+provider:
+  name: aws
+  runtime: python3.9
+functions:
+  hello:
+    handler: handler.hello
+"""
+
+_SLS_HTTP = """
+service: my-api
+provider:
+  name: aws
+  runtime: python3.9
+functions:
+  api:
+    handler: handler.api
+    events:
+      - http:
+          path: /
+          method: get
+"""
+
+_SLS_SQS = """
+service: my-worker
+provider:
+  name: aws
+  runtime: python3.9
+functions:
+  worker:
+    handler: handler.process
+    events:
+      - sqs:
+          arn: arn:aws:sqs:us-east-1:123456789:my-queue
+"""
+
+_PY_VALID = """
+def hello():
+    print("Hello, World!")
+
+class MyClass:
+    def method(self):
+        return 42
+"""
+
+_PY_INVALID = """
+def broken(
+    # Missing closing parenthesis
+"""
+
+
+class _FakeContainer:
+    """Stand-in for a docker-py container that records removal."""
+
+    def __init__(
+        self,
+        logs: bytes = b"",
+        raises: Exception | None = None,
+        container_id: str = "f" * 64,
+        labels: dict[str, str] | None = None,
+        image: str = "localstack/localstack",
+    ):
+        self.id = container_id
+        self.labels = labels or {}
+        self.image = image
+        self._logs = logs
+        self._raises = raises
+        self.remove_kwargs: dict | None = None
+
+    def remove(self, **kwargs):
+        self.remove_kwargs = kwargs
+
+    def logs(self, **kwargs):
+        if self._raises is not None:
+            raise self._raises
+        return self._logs
+
+
+class _FakeContainerCollection:
+    """Stand-in for DockerClient.containers that applies and records list filters.
+
+    Supports the filters lsqm uses: "label" ("key" or "key=value") and
+    "ancestor" (image name).
+    """
+
+    def __init__(self, containers: list[_FakeContainer]):
+        self._containers = containers
+        self.list_calls: list[dict] = []
+
+    def list(self, **kwargs):
+        self.list_calls.append(kwargs)
+        filters = kwargs.get("filters", {})
+        matches = self._containers
+        if "label" in filters:
+            key, _, value = filters["label"].partition("=")
+            matches = [
+                c for c in matches if key in c.labels and (not value or c.labels[key] == value)
+            ]
+        if "ancestor" in filters:
+            matches = [c for c in matches if c.image == filters["ancestor"]]
+        return matches
+
+
+class _FakeDockerClient:
+    """Stand-in for docker.DockerClient."""
+
+    def __init__(self, containers: list[_FakeContainer]):
+        self.containers = _FakeContainerCollection(containers)
+
+
+class TestLocalStackServices:
+    """Tests for LocalStack services module."""
+
+    def test_is_service_supported_valid(self):
+        """Test that valid services are recognized."""
+        assert is_service_supported("s3") is True
+        assert is_service_supported("lambda") is True
+        assert is_service_supported("dynamodb") is True
+        assert is_service_supported("ec2") is True
+        assert is_service_supported("sqs") is True
+
+    def test_is_service_supported_invalid(self):
+        """Test that invalid services are rejected."""
+        assert is_service_supported("fake_service") is False
+        assert is_service_supported("not_aws") is False
+        assert is_service_supported("") is False
+
+    def test_localstack_services_not_empty(self):
+        """Test that LOCALSTACK_COMMUNITY_SERVICES set is populated."""
+        assert len(LOCALSTACK_COMMUNITY_SERVICES) > 0
+        assert "s3" in LOCALSTACK_COMMUNITY_SERVICES
+        assert "lambda" in LOCALSTACK_COMMUNITY_SERVICES
+
+    @pytest.mark.parametrize(
+        ("tf_content", "expected"),
+        [
+            pytest.param(_TF_BUCKET, {"s3"}, id="s3"),
+            pytest.param(_TF_LAMBDA, {"lambda"}, id="lambda"),
+            pytest.param(_TF_MULTI_RESOURCES, {"s3", "lambda", "dynamodb", "sqs"}, id="multiple"),
+            pytest.param("", set(), id="empty-content"),
+            pytest.param(_TF_NO_RESOURCES, set(), id="no-aws-resources"),
+        ],
+    )
+    def test_extract_services_from_terraform(self, tf_content, expected):
+        """Test extracting services from Terraform."""
+        services = extract_services_from_terraform(tf_content)
+        assert expected <= services
+        if not expected:
+            assert len(services) == 0
+
+    @pytest.mark.parametrize(
+        ("tf_content", "standalone", "reason_fragment"),
+        [
+            pytest.param(_TF_BUCKET, True, "", id="with-resources"),
+            pytest.param(_TF_DEFAULTED_VAR, True, "", id="with-resources-and-defaults"),
+            pytest.param(_TF_ALLOWED_DATA_SOURCES, True, "", id="allowed-data-sources"),
+            pytest.param(_TF_REQUIRED_VAR, False, "required variables", id="required-variables"),
+            pytest.param(_TF_MODULE_ONLY, False, "module composition", id="module-only"),
+            pytest.param(_TF_NO_RESOURCES, False, "no resources", id="no-resources"),
+            pytest.param(_TF_REMOTE_STATE, False, "external state", id="remote-state"),
+        ],
+    )
+    def test_is_standalone_architecture(self, tf_content, standalone, reason_fragment):
+        """Test standalone detection and the reason given for rejections."""
         is_standalone, reason = is_standalone_architecture(tf_content)
-        assert is_standalone is True
+        assert is_standalone is standalone
+        if standalone:
+            assert reason == ""
+        else:
+            assert reason_fragment in reason.lower()
 
 
-class TestComparator:
-    """Tests for comparator service."""
+# Template for compare_runs entries; services is a tuple so the copies can share it
+_BASE_ARCH = {"status": "PASSED", "name": "test-arch", "services": ("s3",)}
 
-    def test_compare_runs_no_changes(self):
-        """Test comparing runs with no status changes."""
-        current = {
-            "hash1": {"status": "PASSED", "services": ["s3"]},
-            "hash2": {"status": "FAILED", "services": ["lambda"]},
-        }
-        previous = {
-            "hash1": {"status": "PASSED", "services": ["s3"]},
-            "hash2": {"status": "FAILED", "services": ["lambda"]},
-        }
 
-        result = compare_runs(current, previous, "run-2", "run-1")
+@pytest.fixture
+def arch():
+    """Return a factory for compare_runs entries based on _BASE_ARCH."""
 
-        assert result["regressions_count"] == 0
-        assert result["fixes_count"] == 0
+    def make(**overrides):
+        return {**_BASE_ARCH, **overrides}
 
-    def test_compare_runs_regression_detected(self):
-        """Test detecting a regression (passed -> failed)."""
-        current = {
-            "hash1": {"status": "FAILED", "name": "test-arch", "services": ["s3"]},
-        }
-        previous = {
-            "hash1": {"status": "PASSED", "name": "test-arch", "services": ["s3"]},
-        }
+    return make
 
-        result = compare_runs(current, previous, "run-2", "run-1")
 
-        assert result["regressions_count"] == 1
-        assert result["regressions"][0]["arch_hash"] == "hash1"
-        assert result["regressions"][0]["from_status"] == "PASSED"
-        assert result["regressions"][0]["to_status"] == "FAILED"
+class TestComparator:
+    """Tests for comparator service."""
 
-    def test_compare_runs_fix_detected(self):
-        """Test detecting a fix (failed -> passed)."""
-        current = {
-            "hash1": {"status": "PASSED", "name": "test-arch", "services": ["s3"]},
-        }
-        previous = {
-            "hash1": {"status": "FAILED", "name": "test-arch", "services": ["s3"]},
-        }
+    def test_compare_runs_no_changes(self, arch):
+        """Test comparing runs with no status changes."""
+        current = {"hash1": arch(), "hash2": arch(status="FAILED", services=("lambda",))}
+        previous = {"hash1": arch(), "hash2": arch(status="FAILED", services=("lambda",))}
 
         result = compare_runs(current, previous, "run-2", "run-1")
 
-        assert result["fixes_count"] == 1
-        assert result["fixes"][0]["arch_hash"] == "hash1"
-        assert result["fixes"][0]["from_status"] == "FAILED"
-        assert result["fixes"][0]["to_status"] == "PASSED"
+        assert result["regressions_count"] == 0
+        assert result["fixes_count"] == 0
 
-    def test_compare_runs_partial_to_failed_is_regression(self):
-        """Test that partial -> failed is a regression."""
-        current = {
-            "hash1": {"status": "FAILED", "services": ["s3"]},
-        }
-        previous = {
-            "hash1": {"status": "PARTIAL", "services": ["s3"]},
-        }
+    @pytest.mark.parametrize(
+        ("from_status", "to_status", "expected_regressions", "expected_fixes"),
+        [
+            pytest.param("PASSED", "FAILED", 1, 0, id="passed-to-failed-is-regression"),
+            pytest.param("FAILED", "PASSED", 0, 1, id="failed-to-passed-is-fix"),
+            pytest.param("PARTIAL", "FAILED", 1, 0, id="partial-to-failed-is-regression"),
+        ],
+    )
+    def test_compare_runs_status_change(
+        self, arch, from_status, to_status, expected_regressions, expected_fixes
+    ):
+        """Test that status transitions are reported as regressions or fixes."""
+        current = {"hash1": arch(status=to_status)}
+        previous = {"hash1": arch(status=from_status)}
 
         result = compare_runs(current, previous, "run-2", "run-1")
 
-        assert result["regressions_count"] == 1
+        assert result["regressions_count"] == expected_regressions
+        assert result["fixes_count"] == expected_fixes
+        for change in result["regressions"] + result["fixes"]:
+            assert change["arch_hash"] == "hash1"
+            assert change["from_status"] == from_status
+            assert change["to_status"] == to_status
 
-    def test_compare_runs_new_architecture_not_counted(self):
+    def test_compare_runs_new_architecture_not_counted(self, arch):
         """Test that new architectures don't cause regressions."""
         current = {
-            "hash1": {"status": "FAILED", "services": ["s3"]},
-            "hash2": {"status": "PASSED", "services": ["lambda"]},  # New
-        }
-        previous = {
-            "hash1": {"status": "FAILED", "services": ["s3"]},
+            "hash1": arch(status="FAILED"),
+            "hash2": arch(services=("lambda",)),  # New
         }
+        previous = {"hash1": arch(status="FAILED")}
 
         result = compare_runs(current, previous, "run-2", "run-1")
 
@@ -322,88 +403,31 @@ class TestComparator:
 class TestNormalizer:
     """Tests for normalizer service."""
 
-    def test_serverless_to_terraform_basic(self):
-        """Test basic Serverless Framework to Terraform conversion."""
-        serverless_yml = """
-service: my-service
-provider:
-  name: aws
-  runtime: python3.9
-functions:
-  hello:
-    handler: handler.hello
-"""
+    @pytest.mark.parametrize(
+        ("serverless_yml", "expected"),
+        [
+            pytest.param(_SLS_BASIC, {"lambda"}, id="basic"),
+            # API Gateway should be added for HTTP events
+            pytest.param(_SLS_HTTP, {"lambda", "apigateway"}, id="http-events"),
+            pytest.param(_SLS_SQS, {"lambda", "sqs"}, id="sqs-events"),
+        ],
+    )
+    def test_serverless_to_terraform(self, serverless_yml, expected):
+        """Test Serverless Framework to Terraform conversion."""
         tf_files, services = serverless_to_terraform(serverless_yml)
 
         # Check that lambda function resource is generated
         if tf_files:  # May be empty if no functions
             combined_tf = "\n".join(tf_files.values())
             assert "aws_lambda_function" in combined_tf
-        assert "lambda" in services
-
-    def test_serverless_to_terraform_with_events(self):
-        """Test Serverless with HTTP events."""
-        serverless_yml = """
-service: my-api
-provider:
-  name: aws
-  runtime: python3.9
-functions:
-  api:
-    handler: handler.api
-    events:
-      - http:
-          path: /
-          method: get
-"""
-        tf_files, services = serverless_to_terraform(serverless_yml)
-
-        assert "lambda" in services
-        # API Gateway should be added for HTTP events
-        assert "apigateway" in services
-
-    def test_serverless_to_terraform_with_sqs(self):
-        """Test Serverless with SQS event."""
-        serverless_yml = """
-service: my-worker
-provider:
-  name: aws
-  runtime: python3.9
-functions:
-  worker:
-    handler: handler.process
-    events:
-      - sqs:
-          arn: arn:aws:sqs:us-east-1:123456789:my-queue
-"""
-        tf_files, services = serverless_to_terraform(serverless_yml)
-
-        assert "lambda" in services
-        assert "sqs" in services
+        assert expected <= services
 
 
 class TestReporter:
     """Tests for reporter service."""
 
-    def test_generate_html_report(self, temp_dir):
+    def test_generate_html_report(self, artifacts_dir, temp_dir):
         """Test generating HTML report."""
-        # Setup artifacts directory structure
-        artifacts_dir = temp_dir / "artifacts"
-        artifacts_dir.mkdir(parents=True)
-        (artifacts_dir / "architectures").mkdir()
-
-        # Create index.json
-        index = {
-            "architectures": {
-                "a1b2c3d4": {
-                    "name": "test-arch",
-                    "services": ["s3", "lambda"],
-                }
-            }
-        }
-        with open(artifacts_dir / "architectures" / "index.json", "w") as f:
-            json.dump(index, f)
-
         run_data = {
             "run_id": "test-run-123",
             "started_at": "2026-01-10T00:00:00",
@@ -436,8 +460,7 @@ class TestReporter:
         assert report_path.name == "index.html"
 
         # Check report content
-        with open(report_path) as f:
-            content = f.read()
+        content = report_path.read_text()
         assert "LocalStack Quality Monitor" in content
         assert "test-run-123" in content
         assert "test-arch" in content
@@ -473,8 +496,6 @@ class TestGeneratorMocked:
 
     def test_extract_files_from_response(self):
         """Test extracting files from Claude response."""
-        from lsqm.services.generator import _extract_files_from_response
-
         response = """
 Here are the generated files:
 
@@ -496,8 +517,6 @@ Here are the generated files:
 
     def test_extract_files_invalid_json(self):
         """Test extracting files from invalid response."""
-        from lsqm.services.generator import _extract_files_from_response
-
         response = "This is not valid JSON"
         files = _extract_files_from_response(response)
 
@@ -505,82 +524,379 @@ Here are the generated files:
 
     def test_extract_files_missing_required(self):
         """Test extracting files when required files missing."""
-        from lsqm.services.generator import _extract_files_from_response
-
         response = '{"app.py": "code"}'  # Missing other required files
         files = _extract_files_from_response(response)
 
         assert files == {}
 
-    def test_validate_python_syntax_valid(self):
-        """Test validating valid Python syntax."""
-        from lsqm.services.generator import _validate_python_syntax
+    @pytest.mark.parametrize(
+        ("code", "expected_valid"),
+        [
+            pytest.param(_PY_VALID, True, id="valid"),
+            pytest.param(_PY_INVALID, False, id="invalid"),
+        ],
+    )
+    def test_validate_python_syntax(self, code, expected_valid):
+        """Test validating Python syntax."""
+        valid, error = _validate_python_syntax(code)
 
-        code = """
-def hello():
-    print("Hello, World!")
+        assert valid is expected_valid
+        assert (error is None) is expected_valid
 
-class MyClass:
-    def method(self):
-        return 42
-"""
-        valid, error = _validate_python_syntax(code)
 
-        assert valid is True
-        assert error is None
+class TestValidatorHelpers:
+    """Tests for validator helper functions."""
 
-    def test_validate_python_syntax_invalid(self):
-        """Test validating invalid Python syntax."""
-        from lsqm.services.generator import _validate_python_syntax
+    def test_cleanup_stale_containers_mocked(self, monkeypatch):
+        """Test cleanup function with a fake Docker client."""
+        container = _FakeContainer(container_id="a" * 64, labels={"lsqm": "true"})
+        unlabeled = _FakeContainer(container_id="b" * 64)
+        unrelated = _FakeContainer(container_id="c" * 64, image="nginx")
+        # The labeled container also matches the legacy image filter
+        client = _FakeDockerClient([container, unlabeled, unrelated])
+        monkeypatch.setattr("lsqm.services.validator.docker.from_env", lambda: client)
+
+        removed = cleanup_stale_containers()
+
+        assert removed == 2
+        assert client.containers.list_calls == [
+            {"all": True, "filters": {"label": "lsqm=true"}},
+            {"all": True, "filters": {"ancestor": "localstack/localstack"}},
+        ]
+        assert container.remove_kwargs == {"force": True, "v": True}
+        assert unlabeled.remove_kwargs == {"force": True, "v": True}
+        assert unrelated.remove_kwargs is None
+
+    def test_parse_junit_report(self, temp_dir):
+        """Test parsing individual test results from a JUnit XML report."""
+        report = temp_dir / "report.xml"
+        report.write_text(
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<testsuites><testsuite name="pytest" tests="3">'
+            '<testcase classname="test_app" name="test_put_object" time="0.25"/>'
+            '<testcase classname="test_app" name="test_get_object" time="0.10">'
+            '<failure message="AssertionError">Traceback\nassert 1 == 2\nAssertionError</failure>'
+            "</testcase>"
+            '<testcase classname="test_app" name="test_list_objects" time="0.00">'
+            '<skipped message="not supported"/>'
+            "</testcase>"
+            "</testsuite></testsuites>"
+        )
 
-        code = """
-def broken(
-    # Missing closing parenthesis
-"""
-        valid, error = _validate_python_syntax(code)
+        results, counts = _parse_junit_report(report)
+
+        assert [r.status for r in results] == ["passed", "failed", "skipped"]
+        assert counts == {"passed": 1, "failed": 1, "skipped": 1, "error": 0}
+        assert results[0].test_name == "test_put_object"
+        assert results[0].duration == 0.25
+        assert results[1].error_message.endswith("AssertionError")
+        assert _parse_junit_report(temp_dir / "missing.xml") is None
+
+    def test_junit_error_testcases_count_as_failed(self, temp_dir):
+        """Test that a test module that fails to import does not count as passing."""
+        report = temp_dir / "report.xml"
+        report.write_text(
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<testsuites><testsuite name="pytest" errors="1" tests="1">'
+            '<testcase classname="" name="test_app">'
+            '<error message="collection failure">ImportError: No module named boto3</error>'
+            "</testcase>"
+            "</testsuite></testsuites>"
+        )
+
+        results, counts = _parse_junit_report(report)
+
+        assert _aggregate_test_counts(results, counts, "") == (1, 0, 1, 0)
+
+    def test_parse_pytest_verbose_output_failure_details(self):
+        """Test that failed tests pick up their traceback from the FAILURES section."""
+        output = (
+            "test_app.py::test_put_object PASSED [ 50%]\n"
+            "test_app.py::test_get_object FAILED [100%]\n"
+            "\n"
+            "=================== FAILURES ===================\n"
+            "_______________ test_get_object _______________\n"
+            "test_app.py:10: in test_get_object\n"
+            "E   assert 1 == 2\n"
+            "=========== short test summary info ============\n"
+        )
+
+        results, counts = _parse_pytest_verbose_output(output)
+
+        assert [r.status for r in results] == ["passed", "failed"]
+        assert counts["passed"] == 1 and counts["failed"] == 1
+        assert results[0].error_message is None
+        assert results[1].error_message.endswith("E   assert 1 == 2")
+
+    async def test_container_pool_reuses_containers(self):
+        """Test that released containers are reset and handed out again."""
+        with (
+            patch("lsqm.services.validator._start_localstack_container") as mock_start,
+            patch("lsqm.services.validator._reset_localstack_state", return_value=True),
+            patch("lsqm.services.validator._force_remove") as mock_remove,
+        ):
+            mock_start.side_effect = lambda *args, **kwargs: MagicMock(
+                attrs={"NetworkSettings": {"Ports": {"4566/tcp": [{"HostPort": "49153"}]}}}
+            )
+            pool = _ContainerPool("latest", max_idle=2, max_uses=2)
+
+            first, endpoint = await pool.acquire({"s3"}, "lsqm_a")
+            await pool.release(first, endpoint, {"s3"})
+            second, _ = await pool.acquire({"s3"}, "lsqm_b")
+
+            assert second is first
+            assert endpoint == "http://localhost:49153"
+            assert mock_start.call_count == 1
+
+            # Second use reaches max_uses, so the container is recycled
+            await pool.release(second, endpoint, {"s3"})
+            mock_remove.assert_called_once_with(first)
+            await pool.close()
+
+    async def test_container_pool_reuses_superset_container(self):
+        """Test that an idle container with more services serves a smaller set."""
+        with (
+            patch("lsqm.services.validator._start_localstack_container") as mock_start,
+            patch("lsqm.services.validator._reset_localstack_state", return_value=True),
+            patch("lsqm.services.validator._force_remove"),
+        ):
+            mock_start.side_effect = lambda *args, **kwargs: MagicMock()
+            pool = _ContainerPool("latest", max_idle=2)
+
+            with patch("lsqm.services.validator._localstack_endpoint"):
+                wide, endpoint = await pool.acquire({"s3", "sqs"}, "lsqm_a")
+                await pool.release(wide, endpoint, {"s3", "sqs"})
+                narrow, _ = await pool.acquire({"s3"}, "lsqm_b")
+                await pool.release(narrow, endpoint, {"s3"})
+                again, _ = await pool.acquire({"s3", "sqs"}, "lsqm_c")
+
+            assert narrow is wide and again is wide
+            assert mock_start.call_count == 1
+            await pool.close()
+
+    def test_collect_state_resources_walks_child_modules(self):
+        """Test that managed resources are collected from every module level."""
+        root_module = {
+            "resources": [
+                {"mode": "managed", "type": "aws_s3_bucket", "name": "b", "values": {}},
+                {"mode": "data", "type": "aws_region", "name": "current", "values": {}},
+            ],
+            "child_modules": [
+                {
+                    "address": "module.queue",
+                    "resources": [
+                        {"mode": "managed", "type": "aws_sqs_queue", "name": "q", "values": {}}
+                    ],
+                }
+            ],
+        }
 
-        assert valid is False
-        assert error is not None
+        resources = _collect_state_resources(root_module)
 
+        assert sorted(r["type"] for r in resources) == ["aws_s3_bucket", "aws_sqs_queue"]
 
-class TestValidatorHelpers:
-    """Tests for validator helper functions."""
+    async def test_wait_or_kill_kills_process_on_timeout(self):
+        """Test that a timed-out subprocess does not keep running."""
+        proc = await asyncio.create_subprocess_exec("sleep", "30")
 
-    def test_cleanup_stale_containers_mocked(self):
-        """Test cleanup function with mocked Docker client."""
-        from lsqm.services.validator import cleanup_stale_containers
+        with pytest.raises(TimeoutError):
+            await _wait_or_kill(proc, proc.wait(), timeout=0.1)
 
-        with patch("lsqm.services.validator.docker") as mock_docker:
-            mock_client = MagicMock()
-            mock_docker.from_env.return_value = mock_client
+        assert await asyncio.wait_for(proc.wait(), timeout=5) < 0
 
-            mock_container = MagicMock()
-            mock_client.containers.list.return_value = [mock_container]
+    async def test_plugin_cache_gate_serializes_only_cold_inits(self):
+        """Test that inits wait for each other only until their providers are cached."""
+        gate = validator._PluginCacheGate()
+        aws = frozenset({"aws", "source=hashicorp/aws", "version=~> 5.0"})
+        random = frozenset({"random"})
 
-            removed = cleanup_stale_containers()
+        async def enter(requirements):
+            async with gate.hold(requirements):
+                pass
 
-            assert removed == 1
-            mock_container.stop.assert_called_once()
-            mock_container.remove.assert_called_once()
+        async with gate.hold(aws):
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(enter(random), timeout=0.05)
+            gate.mark_warm(aws)
+            # Already cached, so it does not wait for the init in progress
+            await asyncio.wait_for(enter(aws), timeout=1)
 
-    def test_get_container_logs(self):
-        """Test getting container logs."""
-        from lsqm.services.validator import _get_container_logs
+    def test_plugin_requirements(self, temp_dir):
+        """Test that provider requirements come from resource types and declarations."""
+        (temp_dir / "main.tf").write_text(
+            "terraform {\n  required_providers {\n    aws = {\n"
+            '      source  = "hashicorp/aws"\n      version = "~> 5.0"\n    }\n  }\n}\n'
+            'provider "aws" {\n  region = "us-east-1"\n}\n'
+            'resource "random_id" "suffix" {\n  byte_length = 4\n}\n'
+            'data "aws_caller_identity" "current" {}\n'
+        )
+
+        assert validator._plugin_requirements(temp_dir) == {
+            "aws",
+            "random",
+            "source=hashicorp/aws",
+            "version=~> 5.0",
+        }
+
+    def test_run_event_loop_supports_subprocesses(self):
+        """Test that the validation event loop can spawn and await subprocesses."""
+
+        async def run_true():
+            proc = await asyncio.create_subprocess_exec("true")
+            return await proc.wait()
+
+        assert validator._run_event_loop(run_true()) == 0
+
+    def test_remove_orphaned_containers_skips_live_and_kept(self, monkeypatch):
+        """Test that only containers of dead lsqm processes on this host are swept."""
+
+        def container(container_id, labels):
+            host = validator._host_identity()
+            labels = {"lsqm_run_id": "run", "lsqm_host": host, **labels}
+            return _FakeContainer(container_id=container_id * 64, labels=labels)
+
+        orphan = container("a", {"lsqm_pid": "999999999"})
+        live = container("b", {"lsqm_pid": str(os.getpid())})
+        kept = container("c", {"lsqm_pid": "999999999", "lsqm_keep": "true"})
+        other_host = container("d", {"lsqm_pid": "999999999", "lsqm_host": "elsewhere/pid:[1]"})
+        # Started by something else entirely, so the label filter excludes it
+        unlabeled = _FakeContainer(container_id="e" * 64, labels={"lsqm_pid": "999999999"})
+        client = _FakeDockerClient([orphan, live, kept, other_host, unlabeled])
+        monkeypatch.setattr(validator, "_get_docker_client", lambda: client)
+
+        removed = _remove_orphaned_containers()
+
+        assert removed == 1
+        assert client.containers.list_calls == [{"all": True, "filters": {"label": "lsqm_run_id"}}]
+        assert orphan.remove_kwargs == {"force": True, "v": True}
+        for container in (live, kept, other_host, unlabeled):
+            assert container.remove_kwargs is None
+
+    def test_stage_files_leaves_artifacts_untouched(self, temp_dir):
+        """Test that rewriting staged (hardlinked) files does not modify the artifacts."""
+        arch_dir = temp_dir / "architectures" / "abc123"
+        arch_dir.mkdir(parents=True)
+        original = 'provider "aws" {\n  profile = "default"\n}\n'
+        (arch_dir / "main.tf").write_text(original)
+        (arch_dir / "README.md").write_text("ignored")
+        app_dir = temp_dir / "apps" / "abc123"
+        app_dir.mkdir(parents=True)
+        (app_dir / "test_app.py").write_text("def test_ok(): pass\n")
+
+        work_dir = temp_dir / "work"
+        work_dir.mkdir()
+        _stage_files(temp_dir, "abc123", work_dir)
+        _rewrite_tf_files(sorted(work_dir.glob("*.tf")))
+
+        assert sorted(p.name for p in work_dir.iterdir()) == ["main.tf", "test_app.py"]
+        assert "profile" not in (work_dir / "main.tf").read_text()
+        assert (arch_dir / "main.tf").read_text() == original
+
+    def test_remove_pro_only_resources_handles_nested_blocks(self, temp_dir):
+        """Test that Pro-only blocks are removed whole, whatever their nesting."""
+        (temp_dir / "main.tf").write_text(
+            'resource "aws_glue_job" "job" {\n'
+            "  command {\n"
+            "    args = { a = { b = 1 } }  # closing } in a comment\n"
+            "  }\n"
+            "}\n"
+            'resource "aws_s3_bucket" "bucket" {\n'
+            '  bucket = "x"\n'
+            "}\n"
+        )
+
+        removed = _remove_pro_only_resources(temp_dir, [temp_dir / "main.tf"])
+
+        assert [(r.resource_type, r.resource_name) for r in removed] == [("aws_glue_job", "job")]
+        assert (temp_dir / "main.tf").read_text() == (
+            "# Resource removed - requires LocalStack Pro\n"
+            'resource "aws_s3_bucket" "bucket" {\n'
+            '  bucket = "x"\n'
+            "}\n"
+        )
+
+    def test_remove_pro_only_resources_skips_heredoc_bodies(self, temp_dir):
+        """Test that comment and brace characters inside a heredoc do not end the scan."""
+        (temp_dir / "main.tf").write_text(
+            'resource "aws_glue_job" "job" {\n'
+            "  description = <<-EOT\n"
+            "    cp /data/* /out\n"
+            "    }\n"
+            "  EOT\n"
+            "}\n"
+            'resource "aws_s3_bucket" "bucket" {\n'
+            '  bucket = "x"\n'
+            "}\n"
+        )
 
-        mock_container = MagicMock()
-        mock_container.logs.return_value = b"Container log output"
+        removed = _remove_pro_only_resources(temp_dir, [temp_dir / "main.tf"])
 
-        logs = _get_container_logs(mock_container)
+        assert [(r.resource_type, r.resource_name) for r in removed] == [("aws_glue_job", "job")]
+        assert (temp_dir / "main.tf").read_text() == (
+            "# Resource removed - requires LocalStack Pro\n"
+            'resource "aws_s3_bucket" "bucket" {\n'
+            '  bucket = "x"\n'
+            "}\n"
+        )
+
+    def test_remove_provider_blocks_with_deep_nesting(self):
+        """Test that removed provider blocks may nest braces more than one level."""
+        content = (
+            'terraform {\n  backend "s3" {\n    a = { b = { c = "}" } }\n  }\n}\n'
+            'provider "aws" {\n  default_tags {\n'
+            '    tags = merge({ A = "b" }, { C = "d" })\n  }\n}\n'
+        )
+
+        result = _remove_provider_default_tags(_remove_backend_configuration(content))
+
+        assert result == 'terraform {\n}\nprovider "aws" {\n}\n'
+
+    def test_preprocess_terraform_reports_only_rewritten_files(self, temp_dir):
+        """Test that modified_files lists the files preprocessing changed."""
+        (temp_dir / "main.tf").write_text('resource "aws_s3_bucket" "b" {\n  bucket = "x"\n}\n')
+        (temp_dir / "backend.tf").write_text(
+            'terraform {\n  backend "s3" {\n    bucket = "state"\n  }\n}\n'
+        )
+
+        delta = validator._preprocess_terraform(temp_dir, {"s3"})
+
+        assert delta.modified_files == ["backend.tf"]
+
+    def test_preprocess_terraform_cached_reuses_prepared_tree(self, temp_dir):
+        """Test that identical inputs are preprocessed once and then linked from cache."""
+        main_tf = (
+            'variable "name" {\n  type = string\n}\n'
+            'resource "aws_s3_bucket" "b" {\n  bucket = var.name\n}\n'
+        )
+        work_dirs = []
+        for name in ("first", "second"):
+            work_dir = temp_dir / name
+            work_dir.mkdir()
+            (work_dir / "main.tf").write_text(main_tf)
+            work_dirs.append(work_dir)
+
+        with patch(
+            "lsqm.services.validator._preprocess_terraform",
+            wraps=validator._preprocess_terraform,
+        ) as mock_preprocess:
+            first = validator._preprocess_terraform_cached(work_dirs[0], {"s3"}, temp_dir / "prep")
+            second = validator._preprocess_terraform_cached(work_dirs[1], {"s3"}, temp_dir / "prep")
+
+        assert mock_preprocess.call_count == 1
+        assert second.to_dict() == first.to_dict()
+        assert second.generated_tfvars == {"name": '"lsqm-test"'}
+        assert (work_dirs[1] / "terraform.tfvars").read_text() == (
+            work_dirs[0] / "terraform.tfvars"
+        ).read_text()
+
+    def test_get_container_logs(self):
+        """Test getting container logs."""
+        logs = _get_container_logs(_FakeContainer(logs=b"Container log output"))
 
         assert "Container log output" in logs
 
     def test_get_container_logs_error(self):
         """Test getting container logs when error occurs."""
-        from lsqm.services.validator import _get_container_logs
-
-        mock_container = MagicMock()
-        mock_container.logs.side_effect = Exception("Docker error")
-
-        logs = _get_container_logs(mock_container)
+        logs = _get_container_logs(_FakeContainer(raises=Exception("Docker error")))
 
         assert logs == ""
@@ -1,10 +1,14 @@
 """Tests for LSQM utility modules."""
 
+import io
 import json
 import logging
+import queue
 
+import pytest
 import yaml
 
+from lsqm.utils import logging as logging_utils
 from lsqm.utils.config import (
     CDKSourceConfig,
     GitHubOrgsSourceConfig,
@@ -19,7 +23,15 @@ from lsqm.utils.config import (
     load_config,
 )
 from lsqm.utils.hashing import compute_architecture_hash, normalize_terraform
-from lsqm.utils.logging import JSONFormatter, get_logger, stage_context
+from lsqm.utils.logging import (
+    JSONFormatter,
+    _BatchingStreamHandler,
+    _DrainingQueueListener,
+    _PassthroughQueueHandler,
+    flush_logs,
+    get_logger,
+    stage_context,
+)
 
 
 class TestLSQMConfig:
@@ -78,6 +90,25 @@ class TestLSQMConfig:
         assert config.artifact_repo_name == "repo-only"
 
 
+@pytest.fixture(scope="session")
+def yaml_config_file(tmp_path_factory):
+    """Write the YAML config shared by the load_config tests once per session."""
+    yaml_config = {
+        "anthropic_api_key": "sk-ant-yaml-key",
+        "github_token": "ghp_yaml_token",
+        "artifact_repo": "yaml-org/yaml-repo",
+        "parallel": 6,
+        "sources": {
+            "terraform_registry": False,
+        },
+    }
+    config_file = tmp_path_factory.mktemp("config") / "config.yaml"
+    config_file.write_text(
+        yaml.dump(yaml_config, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+    )
+    return config_file
+
+
 class TestLoadConfig:
     """Tests for load_config function."""
 
@@ -99,54 +130,33 @@ class TestLoadConfig:
         assert config.parallel == 8
         assert config.timeout == 600
 
-    def test_load_config_from_yaml(self, monkeypatch, temp_dir):
+    def test_load_config_from_yaml(self, monkeypatch, yaml_config_file):
         """Test loading config from YAML file."""
         # Clear environment variables
         monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
         monkeypatch.delenv("GITHUB_TOKEN", raising=False)
         monkeypatch.delenv("ARTIFACT_REPO", raising=False)
-
-        yaml_config = {
-            "anthropic_api_key": "sk-ant-yaml-key",
-            "github_token": "ghp_yaml_token",
-            "artifact_repo": "yaml-org/yaml-repo",
-            "parallel": 6,
-            "sources": {
-                "terraform_registry": False,
-            },
-        }
-
-        config_file = temp_dir / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(yaml_config, f)
+        monkeypatch.delenv("LSQM_PARALLEL", raising=False)
 
         # Pass explicit non-existent sources_path to prevent loading ./sources.yaml
-        nonexistent_sources = temp_dir / "nonexistent_sources.yaml"
-        config = load_config(config_file, sources_path=nonexistent_sources)
+        nonexistent_sources = yaml_config_file.parent / "nonexistent_sources.yaml"
+        config = load_config(yaml_config_file, sources_path=nonexistent_sources)
 
         assert config.anthropic_api_key == "sk-ant-yaml-key"
         assert config.github_token == "ghp_yaml_token"
         assert config.parallel == 6
         assert config.sources.terraform_registry.enabled is False
 
-    def test_env_overrides_yaml(self, monkeypatch, temp_dir):
+    def test_env_overrides_yaml(self, monkeypatch, yaml_config_file):
         """Test that environment variables override YAML config."""
-        yaml_config = {
-            "anthropic_api_key": "sk-ant-yaml-key",
-            "github_token": "ghp_yaml_token",
-            "artifact_repo": "yaml-org/yaml-repo",
-        }
-
-        config_file = temp_dir / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(yaml_config, f)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
 
         # Set env var to override
         monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-override")
 
         # Pass explicit non-existent sources_path to prevent loading ./sources.yaml
-        nonexistent_sources = temp_dir / "nonexistent_sources.yaml"
-        config = load_config(config_file, sources_path=nonexistent_sources)
+        nonexistent_sources = yaml_config_file.parent / "nonexistent_sources.yaml"
+        config = load_config(yaml_config_file, sources_path=nonexistent_sources)
 
         assert config.anthropic_api_key == "sk-ant-override"  # From env
         assert config.github_token == "ghp_yaml_token"  # From YAML
@@ -326,6 +336,77 @@ class TestJSONFormatter:
 
         assert data["arch_hash"] == "abc123"
 
+    def test_json_formatter_timestamp_uses_record_time(self):
+        """Test that the timestamp is the record's creation time in UTC."""
+        formatter = JSONFormatter()
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=1,
+            msg="Test message",
+            args=(),
+            exc_info=None,
+        )
+        record.created = 1_000_000_000.25
+
+        data = json.loads(formatter.format(record))
+
+        assert data["timestamp"] == "2001-09-09T01:46:40.250000Z"
+
+
+class TestBatchingStreamHandler:
+    """Tests for the batching handler behind the log listener."""
+
+    def test_failed_write_drops_batch_and_keeps_listener_running(self, monkeypatch):
+        """Test that a write error is reported rather than raised on the listener thread."""
+        monkeypatch.setattr(logging, "raiseExceptions", False)
+        closed = io.StringIO()
+        closed.close()
+        handler = _BatchingStreamHandler(closed)
+        listener = _DrainingQueueListener(queue.SimpleQueue(), handler)
+
+        def record(msg):
+            return logging.LogRecord("lsqm", logging.INFO, __file__, 1, msg, None, None)
+
+        listener.handle(record("lost"))
+
+        stream = io.StringIO()
+        handler.setStream(stream)
+        listener.handle(record("written"))
+
+        assert stream.getvalue() == "written\n"
+
+    def test_flush_logs_writes_queued_records(self, monkeypatch):
+        """Test that flush_logs drains the queue before the listener stops."""
+        stream = io.StringIO()
+        handler = _BatchingStreamHandler(stream)
+        log_queue = queue.SimpleQueue()
+        listener = _DrainingQueueListener(log_queue, handler)
+        monkeypatch.setattr(logging_utils, "_log_listener", listener)
+        for msg in ("first", "last"):
+            log_queue.put(logging.LogRecord("lsqm", logging.INFO, __file__, 1, msg, None, None))
+        listener.start()
+
+        flush_logs()
+        flush_logs()  # Already stopped; a second call (as at exit) is a no-op
+
+        assert stream.getvalue() == "first\nlast\n"
+
+    def test_queue_handler_leaves_formatting_to_listener(self):
+        """Test that records are queued with their arguments still unformatted."""
+        log_queue = queue.SimpleQueue()
+        handler = _PassthroughQueueHandler(log_queue)
+        record = logging.LogRecord(
+            "lsqm", logging.INFO, __file__, 1, "Stage %s started", ("fetch",), None
+        )
+
+        handler.handle(record)
+
+        queued = log_queue.get_nowait()
+        assert queued is record
+        assert (queued.msg, queued.args) == ("Stage %s started", ("fetch",))
+
 
 class TestGetLogger:
     """Tests for get_logger function."""
@@ -343,6 +424,16 @@ class TestGetLogger:
 
         assert logger.level == logging.DEBUG
 
+    def test_get_logger_children_share_root_handler(self):
+        """Test that lsqm.* loggers propagate to the lsqm handler instead of adding their own."""
+        root = get_logger("lsqm")
+        child = get_logger("lsqm.test_child")
+
+        assert child.handlers == []
+        assert child.propagate
+        assert len(root.handlers) == 1
+        assert get_logger("test_other").handlers == root.handlers
+
 
 class TestStageContext:
     """Tests for stage_context context manager."""